@@ -1,15 +1,26 @@
+import time
 import streamlit as st
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from tsdownsample import MinMaxLTTBDownsampler
 from datetime import datetime
 
 # =====================================
 # ⚙️ KONFIGURASI DASAR
 # =====================================
 st.set_page_config(page_title="Tactical Weather Ops — BMKG", layout="wide")
+# copy-on-write → slice & seleksi kolom jadi view sampai benar-benar ditulis
+# (default sejak pandas 3, di sana opsi ini deprecated)
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
 
 # 🌑 CSS — MILITARY STYLE + RADAR ANIMATION
 st.markdown("""
@@ -91,55 +102,215 @@ hr, .stDivider {
 # =====================================
 API_BASE = "https://cuaca.bmkg.go.id/api/df/v1/forecast/adm"
 MS_TO_KT = 1.94384  # konversi ke knot
+MAX_PLOT_POINTS = 1500  # batas titik per trace yang dikirim ke browser
+_DOWNSAMPLER = MinMaxLTTBDownsampler()
 
 # =====================================
 # 🧰 UTILITAS
 # =====================================
-@st.cache_data(ttl=300)
+@st.cache_resource
+def get_session():
+    # script dieksekusi ulang tiap rerun → session disimpan di cache_resource
+    # agar koneksi TCP/TLS ke BMKG benar-benar dipakai ulang antar cache miss
+    session = requests.Session()
+    session.headers.update({"Accept-Encoding": "gzip, deflate", "User-Agent": "infografis-riau/1.0"})
+    # retry singkat untuk gangguan sesaat (5xx gateway / koneksi putus) sebelum error ke UI
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+    return session
+
+@st.cache_resource(ttl=300, show_spinner=False)
 def fetch_forecast(adm1: str):
+    # satu-satunya TTL; cap waktu fetch jadi kunci semua cache turunan, jadi fetch
+    # baru langsung membatalkan frame/label lama. Payload dibagi by reference (read-only).
     params = {"adm1": adm1}
-    resp = requests.get(API_BASE, params=params, timeout=10)
+    resp = get_session().get(API_BASE, params=params, timeout=10)
     resp.raise_for_status()
-    return resp.json()
+    return time.time(), orjson.loads(resp.content)
+
+LOKASI_COLS = ["adm1", "adm2", "provinsi", "kotkab", "lon", "lat"]
+NUMERIC_COLS = ["t", "tcc", "tp", "wd_deg", "ws", "hu", "vs"]
+BMKG_DT_FORMAT = "%Y-%m-%d %H:%M:%S"  # format tetap BMKG → lewati inferensi format
+WIND_SPEED_BINS = [0, 5, 10, 20, 30, 50, 100]  # KT
+WIND_SPEED_LABELS = ["<5", "5–10", "10–20", "20–30", "30–50", ">50"]
+CATEGORY_COLS = ["weather_desc", "weather_desc_en", "image", "wd", "wd_to", "vs_text",
+                 "timezone", "type", "adm1", "adm2", "provinsi", "kotkab"]
+PLOTTED_COLS = ["t", "hu", "ws_kt", "tp", "wd_deg"]  # kolom yang digambar di grafik
+# kolom per-observasi saja; metadata lokasi konstan tidak diulang tiap baris
+EXPORT_COLS = ["local_datetime_dt", "weather_desc", "t", "hu", "ws", "ws_kt", "wd_deg", "tp", "tcc", "vs"]
 
 def flatten_cuaca_entry(entry):
-    rows = []
     lokasi = entry.get("lokasi", {})
-    for group in entry.get("cuaca", []):
-        for obs in group:
-            r = obs.copy()
-            r.update({
-                "adm1": lokasi.get("adm1"),
-                "adm2": lokasi.get("adm2"),
-                "provinsi": lokasi.get("provinsi"),
-                "kotkab": lokasi.get("kotkab"),
-                "lon": lokasi.get("lon"),
-                "lat": lokasi.get("lat"),
-            })
-            try:
-                r["utc_datetime_dt"] = pd.to_datetime(r.get("utc_datetime"))
-                r["local_datetime_dt"] = pd.to_datetime(r.get("local_datetime"))
-            except Exception:
-                r["utc_datetime_dt"], r["local_datetime_dt"] = pd.NaT, pd.NaT
-            rows.append(r)
-    df = pd.DataFrame(rows)
-    for c in ["t", "tcc", "tp", "wd_deg", "ws", "hu", "vs"]:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-    return df
+    obs_list = [obs for group in entry.get("cuaca", []) for obs in group]
+    obs = pd.DataFrame(obs_list)
+    present = [c for c in NUMERIC_COLS if c in obs.columns]
+    # metadata lokasi konstan → broadcast skalar, bukan salin per baris
+    derived = {k: lokasi.get(k) for k in LOKASI_COLS}
+    for src in ["utc_datetime", "local_datetime"]:
+        raw_dt = obs[src] if src in obs.columns else pd.Series(pd.NaT, index=obs.index)
+        derived[f"{src}_dt"] = pd.to_datetime(raw_dt, format=BMKG_DT_FORMAT, errors="coerce")
+    # presisi BMKG ≤ 1 desimal → float32 cukup, separuh memori & payload
+    for c in present:
+        derived[c] = pd.to_numeric(obs[c], errors="coerce").astype(np.float32)
+    # kolom turunan digabung sekali → tanpa insert kolom satu per satu (fragmentasi)
+    return pd.concat([obs.drop(columns=present), pd.DataFrame(derived, index=obs.index)], axis=1)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def build_location_labels(adm1: str, fetched_at: float, _raw: dict):
+    # label per lokasi; posisi di list = posisi entry di raw["data"]. Kunci fetch yang
+    # sama dengan flatten_province → label & data selalu dari payload yang sama
+    labels, seen = [], set()
+    for i, e in enumerate(_raw.get("data", []), 1):
+        lok = e.get("lokasi") or {}
+        label = lok.get("kotkab") or lok.get("adm2") or f"Location {i}"
+        if label in seen:  # nama kembar → bedakan dengan kode adm2 / posisi
+            label = f"{label} ({lok.get('adm2') or i})"
+        seen.add(label)
+        labels.append(label)
+    return labels
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def flatten_province(adm1: str, fetched_at: float, _raw: dict):
+    # flatten semua lokasi sekali per fetch provinsi; disimpan by reference (read-only)
+    entries = _raw.get("data", [])
+    frames = [flatten_cuaca_entry(e).assign(loc_idx=i) for i, e in enumerate(entries)]
+    if not frames:
+        return pd.DataFrame(columns=["loc_idx"])
+    df_all = pd.concat(frames, ignore_index=True)
+    # string berulang (deskripsi, URL ikon, nama wilayah) → kode integer + kamus kecil
+    return df_all.astype({c: "category" for c in CATEGORY_COLS if c in df_all.columns})
+
+def load_location_df(adm1: str, fetched_at: float, raw: dict, loc_idx: int):
+    # ganti lokasi = slice dari frame provinsi, tanpa flatten/parsing ulang
+    df_all = flatten_province(adm1, fetched_at, raw)
+    return df_all[df_all["loc_idx"] == loc_idx]
+
+def fmt_metric(value, spec):
+    # format eksplisit → float32 tidak tampil sebagai 1.7999999523162842
+    return "—" if value is None or pd.isna(value) else format(value, spec)
+
+def downsample_lttb(df, y, n_out=MAX_PLOT_POINTS):
+    # MinMaxLTTB: prefilter min-max lalu LTTB → bentuk kurva terjaga, titik terbatas
+    d = df[["local_datetime_dt", y]].dropna(subset=[y])  # hanya x & y yang dibawa ke plot
+    if len(d) <= n_out:
+        return d
+    x = d["local_datetime_dt"].to_numpy().view(np.int64)
+    idx = _DOWNSAMPLER.downsample(x, d[y].to_numpy(dtype=np.float64), n_out=n_out)
+    return d.iloc[idx]
+
+def iso_datetimes(df):
+    # format ISO sekali per kolom (orjson tidak menerima pd.Timestamp)
+    dt_cols = list(df.select_dtypes("datetime").columns)
+    return df.assign(**{c: df[c].dt.strftime("%Y-%m-%dT%H:%M:%S") for c in dt_cols})
+
+@st.cache_data(show_spinner=False)
+def export_csv(df):
+    # writer CSV Arrow (C++) → bytes langsung untuk download_button
+    buf = pa.BufferOutputStream()
+    pa_csv.write_csv(pa.Table.from_pandas(iso_datetimes(df), preserve_index=False), buf)
+    return buf.getvalue().to_pybytes()
+
+@st.cache_data(show_spinner=False)
+def export_json(df, lokasi):
+    # float32 → float64 terbulatkan agar tidak muncul artefak 27.2999992371
+    f32 = list(df.select_dtypes("float32").columns)
+    df = df.astype({c: "float64" for c in f32}).round({c: 4 for c in f32})
+    return orjson.dumps({"lokasi": lokasi, "data": iso_datetimes(df).to_dict("records")},
+                        option=orjson.OPT_SERIALIZE_NUMPY)
+
+def windrose_percent(wd, ws):
+    # sektor 22.5° langsung sebagai indeks integer (N = 0, wrap 348.75–360 ke N)
+    sector_idx = ((wd % 360 + 11.25) // 22.5).astype(np.int64) % 16
+    speed_idx = np.maximum(np.searchsorted(WIND_SPEED_BINS, ws, side="left") - 1, 0)
+    valid = (ws >= WIND_SPEED_BINS[0]) & (ws <= WIND_SPEED_BINS[-1])
+    n_speed = len(WIND_SPEED_LABELS)
+    counts = np.bincount(sector_idx[valid] * n_speed + speed_idx[valid],
+                         minlength=16 * n_speed).reshape(16, n_speed)
+    return counts / max(counts.sum(), 1) * 100
+
+def frame_key(df):
+    # sidik jari frame per-lokasi: (provinsi, lokasi, jumlah baris, rentang waktu, digest nilai)
+    # digest nilai → run BMKG baru di slot waktu yang sama tetap memicu gambar ulang
+    if df.empty:
+        return (0,)
+    t = df["local_datetime_dt"]
+    plotted = [c for c in PLOTTED_COLS if c in df.columns]
+    digest = int(pd.util.hash_pandas_object(df[plotted], index=False).sum())
+    return (df["adm1"].iloc[0], df["loc_idx"].iloc[0], len(df), t.iloc[0], t.iloc[-1], digest)
+
+def line_trace(df, y, color):
+    # Scattergl (WebGL) → satu draw call di canvas, bukan satu node SVG per titik
+    d = downsample_lttb(df, y)
+    return go.Scattergl(x=d["local_datetime_dt"].to_numpy(), y=d[y].to_numpy(), mode="lines+markers",
+                        name=y, line=dict(color=color))
+
+def rain_trace(df, hourly=False):
+    # total harian → bar jauh lebih sedikit, dan lebih tepat untuk akumulasi hujan
+    if hourly:
+        d, title = downsample_lttb(df, "tp"), "Rainfall (mm)"
+        period = {}
+    else:
+        d = df[["local_datetime_dt", "tp"]].resample("D", on="local_datetime_dt").sum().reset_index()
+        title = "Daily Rainfall (mm)"
+        # label resample = 00:00 → bar digeser ke tengah harinya sendiri, bukan D-1 12:00–D 12:00
+        period = dict(xperiod=86_400_000, xperiodalignment="middle")
+    return go.Bar(x=d["local_datetime_dt"].to_numpy(), y=d["tp"].to_numpy(),
+                  name="tp", marker_color="#ffbf00", marker_line_width=0, **period), title
+
+@st.cache_resource(ttl=300, show_spinner=False, hash_funcs={pd.DataFrame: frame_key})
+def trend_figure(df, hourly_rain=False):
+    # satu figure 2x2 → satu payload JSON & satu render di browser, bukan empat
+    rain, rain_title = rain_trace(df, hourly_rain)
+    fig = make_subplots(rows=2, cols=2, shared_xaxes="all", subplot_titles=(
+        "Temperature (°C)", "Wind Speed (KT)", "Humidity (%)", rain_title))
+    fig.add_trace(line_trace(df, "t", "#a9df52"), 1, 1)
+    fig.add_trace(line_trace(df, "ws_kt", "#00ffbf"), 1, 2)
+    fig.add_trace(line_trace(df, "hu", "#00ffbf"), 2, 1)
+    fig.add_trace(rain, 2, 2)
+    fig.update_yaxes(hoverformat=".2f")
+    fig.update_layout(height=700, showlegend=False)
+    return fig
+
+@st.cache_resource(ttl=300, show_spinner=False, hash_funcs={pd.DataFrame: frame_key})
+def windrose_figure(df):
+    df_wr = df.dropna(subset=["wd_deg", "ws_kt"])
+    if df_wr.empty:
+        return None
+    percent = windrose_percent(df_wr["wd_deg"].to_numpy(dtype=float),
+                               df_wr["ws_kt"].to_numpy(dtype=float))
+    azimuth_arr = np.arange(16) * 22.5
+    colors = ["#00ffbf","#80ff00","#d0ff00","#ffb300","#ff6600","#ff0033"]
+    fig_wr = go.Figure()
+    for i, sc in enumerate(WIND_SPEED_LABELS):
+        fig_wr.add_trace(go.Barpolar(
+            r=percent[:, i], theta=azimuth_arr,
+            name=f"{sc} KT", marker_color=colors[i], opacity=0.85
+        ))
+    fig_wr.update_layout(
+        title="Windrose (KT)",
+        polar=dict(
+            angularaxis=dict(direction="clockwise", rotation=90, tickvals=list(range(0,360,45))),
+            radialaxis=dict(ticksuffix="%", showline=True, gridcolor="#333")
+        ),
+        legend_title="Wind Speed Class",
+        template="plotly_dark"
+    )
+    return fig_wr
 
 # =====================================
 # 🎚️ SIDEBAR
 # =====================================
 with st.sidebar:
     st.title("🛰️ Tactical Controls")
-    adm1 = st.text_input("Province Code (ADM1)", value="32")
+    # normalisasi sekali → " 32" dan "32" berbagi entri cache yang sama
+    adm1 = st.text_input("Province Code (ADM1)", value="32").strip()
     st.markdown("<div class='radar'></div>", unsafe_allow_html=True)
     st.markdown("<p style='text-align:center; color:#5f5;'>Scanning Weather...</p>", unsafe_allow_html=True)
     refresh = st.button("🔄 Fetch Data")
     st.markdown("---")
     show_map = st.checkbox("Show Map", value=True)
     show_table = st.checkbox("Show Table", value=False)
+    hourly_rain = st.checkbox("Hourly Rainfall", value=False)
     st.markdown("---")
     st.caption("Data Source: BMKG API\nTheme: Military Ops v1.0")
 
@@ -149,49 +320,51 @@ with st.sidebar:
 st.title("Tactical Weather Operations Dashboard")
 st.markdown("*Source: BMKG Forecast API — Live Data*")
 
+# payload & frame provinsi hanya direferensikan dari cache_resource, tidak disalin
 with st.spinner("🛰️ Acquiring weather intelligence..."):
     try:
-        raw = fetch_forecast(adm1)
+        fetched_at, raw = fetch_forecast(adm1)
+        labels = build_location_labels(adm1, fetched_at, raw)
     except Exception as e:
         st.error(f"Failed to fetch data: {e}")
         st.stop()
 
-entries = raw.get("data", [])
-if not entries:
+if not labels:
     st.warning("No forecast data available.")
     st.stop()
 
-mapping = {}
-for e in entries:
-    lok = e.get("lokasi", {})
-    label = lok.get("kotkab") or lok.get("adm2") or f"Location {len(mapping)+1}"
-    mapping[label] = {"entry": e}
-
 col1, col2 = st.columns([2, 1])
 with col1:
-    loc_choice = st.selectbox("🎯 Select Location", options=list(mapping.keys()))
+    loc_idx = st.selectbox("🎯 Select Location", options=range(len(labels)),
+                           format_func=labels.__getitem__)
 with col2:
-    st.metric("📍 Locations", len(mapping))
+    st.metric("📍 Locations", len(labels))
 
-selected_entry = mapping[loc_choice]["entry"]
-df = flatten_cuaca_entry(selected_entry)
+loc_choice = labels[loc_idx]
+df = load_location_df(adm1, fetched_at, raw, loc_idx)
 if df.empty:
     st.warning("No valid weather data found.")
     st.stop()
 
+lokasi = df[LOKASI_COLS].iloc[0].to_dict()
+
 df["ws_kt"] = df["ws"] * MS_TO_KT
 
 # =====================================
 # 🕓 SLIDER WAKTU TANPA ERROR
 # =====================================
-df = df.sort_values("utc_datetime_dt")
-
 if df["local_datetime_dt"].isna().all():
     st.error("No valid datetime available in dataset.")
     st.stop()
 
-min_dt = df["local_datetime_dt"].dropna().min().to_pydatetime()
-max_dt = df["local_datetime_dt"].dropna().max().to_pydatetime()
+# urut waktu lokal (selisih UTC konstan) → rentang bisa dipotong via searchsorted
+df = df.dropna(subset=["local_datetime_dt"])
+order = np.argsort(df["local_datetime_dt"].to_numpy().view(np.int64), kind="stable")
+df = df.iloc[order]
+
+# sudah terurut → ujung rentang cukup baris pertama & terakhir
+min_dt = df["local_datetime_dt"].iloc[0].to_pydatetime()
+max_dt = df["local_datetime_dt"].iloc[-1].to_pydatetime()
 
 start_dt = st.sidebar.slider(
     "Time Range (Local)",
@@ -201,9 +374,11 @@ start_dt = st.sidebar.slider(
     step=pd.Timedelta(hours=3)
 )
 
-mask = (df["local_datetime_dt"] >= pd.to_datetime(start_dt[0])) & \
-       (df["local_datetime_dt"] <= pd.to_datetime(start_dt[1]))
-df_sel = df.loc[mask].copy()
+dt_idx = df["local_datetime_dt"].to_numpy()
+lo = dt_idx.searchsorted(np.datetime64(start_dt[0]), side="left")
+hi = dt_idx.searchsorted(np.datetime64(start_dt[1]), side="right")
+df_sel = df.iloc[lo:hi]
+df_export = df_sel[[c for c in EXPORT_COLS if c in df_sel.columns]]
 
 # =====================================
 # ⚡ METRIC PANEL
@@ -213,10 +388,10 @@ st.subheader("⚡ Tactical Weather Status")
 
 now = df_sel.iloc[0]
 c1, c2, c3, c4 = st.columns(4)
-with c1: st.metric("TEMP (°C)", f"{now.get('t', '—')}°C")
-with c2: st.metric("HUMIDITY", f"{now.get('hu', '—')}%")
+with c1: st.metric("TEMP (°C)", f"{fmt_metric(now.get('t'), '.1f')}°C")
+with c2: st.metric("HUMIDITY", f"{fmt_metric(now.get('hu'), '.0f')}%")
 with c3: st.metric("WIND (KT)", f"{now.get('ws_kt', 0):.1f}")
-with c4: st.metric("RAIN (mm)", f"{now.get('tp', '—')}")
+with c4: st.metric("RAIN (mm)", fmt_metric(now.get('tp'), '.1f'))
 
 # =====================================
 # 📈 TREND GRAFIK
@@ -224,21 +399,7 @@ with c4: st.metric("RAIN (mm)", f"{now.get('tp', '—')}")
 st.markdown("---")
 st.subheader("📊 Parameter Trends")
 
-c1, c2 = st.columns(2)
-with c1:
-    st.plotly_chart(px.line(df_sel, x="local_datetime_dt", y="t",
-        title="Temperature (°C)", markers=True,
-        color_discrete_sequence=["#a9df52"]), use_container_width=True)
-    st.plotly_chart(px.line(df_sel, x="local_datetime_dt", y="hu",
-        title="Humidity (%)", markers=True,
-        color_discrete_sequence=["#00ffbf"]), use_container_width=True)
-with c2:
-    st.plotly_chart(px.line(df_sel, x="local_datetime_dt", y="ws_kt",
-        title="Wind Speed (KT)", markers=True,
-        color_discrete_sequence=["#00ffbf"]), use_container_width=True)
-    st.plotly_chart(px.bar(df_sel, x="local_datetime_dt", y="tp",
-        title="Rainfall (mm)",
-        color_discrete_sequence=["#ffbf00"]), use_container_width=True)
+st.plotly_chart(trend_figure(df_sel, hourly_rain), use_container_width=True)
 
 # =====================================
 # 🌪️ WINDROSE
@@ -247,36 +408,8 @@ st.markdown("---")
 st.subheader("🌪️ Windrose — Direction & Speed")
 
 if "wd_deg" in df_sel.columns and "ws_kt" in df_sel.columns:
-    df_wr = df_sel.dropna(subset=["wd_deg", "ws_kt"])
-    if not df_wr.empty:
-        bins_dir = np.arange(-11.25, 360, 22.5)
-        labels_dir = ["N","NNE","NE","ENE","E","ESE","SE","SSE","S","SSW","SW","WSW","W","WNW","NW","NNW"]
-        df_wr["dir_sector"] = pd.cut(df_wr["wd_deg"] % 360, bins=bins_dir, labels=labels_dir, include_lowest=True)
-        speed_bins = [0,5,10,20,30,50,100]
-        speed_labels = ["<5","5–10","10–20","20–30","30–50",">50"]
-        df_wr["speed_class"] = pd.cut(df_wr["ws_kt"], bins=speed_bins, labels=speed_labels, include_lowest=True)
-        freq = df_wr.groupby(["dir_sector","speed_class"]).size().reset_index(name="count")
-        freq["percent"] = freq["count"]/freq["count"].sum()*100
-        az_map = {"N":0,"NNE":22.5,"NE":45,"ENE":67.5,"E":90,"ESE":112.5,"SE":135,"SSE":157.5,
-                  "S":180,"SSW":202.5,"SW":225,"WSW":247.5,"W":270,"WNW":292.5,"NW":315,"NNW":337.5}
-        freq["theta"] = freq["dir_sector"].map(az_map)
-        colors = ["#00ffbf","#80ff00","#d0ff00","#ffb300","#ff6600","#ff0033"]
-        fig_wr = go.Figure()
-        for i, sc in enumerate(speed_labels):
-            subset = freq[freq["speed_class"]==sc]
-            fig_wr.add_trace(go.Barpolar(
-                r=subset["percent"], theta=subset["theta"],
-                name=f"{sc} KT", marker_color=colors[i], opacity=0.85
-            ))
-        fig_wr.update_layout(
-            title="Windrose (KT)",
-            polar=dict(
-                angularaxis=dict(direction="clockwise", rotation=90, tickvals=list(range(0,360,45))),
-                radialaxis=dict(ticksuffix="%", showline=True, gridcolor="#333")
-            ),
-            legend_title="Wind Speed Class",
-            template="plotly_dark"
-        )
+    fig_wr = windrose_figure(df_sel)
+    if fig_wr is not None:
         st.plotly_chart(fig_wr, use_container_width=True)
 
 # =====================================
@@ -286,8 +419,8 @@ if show_map:
     st.markdown("---")
     st.subheader("🗺️ Tactical Map")
     try:
-        lat = float(selected_entry.get("lokasi", {}).get("lat", 0))
-        lon = float(selected_entry.get("lokasi", {}).get("lon", 0))
+        lat = float(lokasi.get("lat", 0))
+        lon = float(lokasi.get("lon", 0))
         st.map(pd.DataFrame({"lat": [lat], "lon": [lon]}))
     except Exception as e:
         st.warning(f"Map unavailable: {e}")
@@ -298,7 +431,7 @@ if show_map:
 if show_table:
     st.markdown("---")
     st.subheader("📋 Forecast Table")
-    st.dataframe(df_sel)
+    st.dataframe(df_export)
 
 # =====================================
 # 💾 EKSPOR
@@ -306,8 +439,9 @@ if show_table:
 st.markdown("---")
 st.subheader("💾 Export Data")
 
-csv = df_sel.to_csv(index=False)
-json_text = df_sel.to_json(orient="records", force_ascii=False, date_format="iso")
+# serialisasi di-cache → slider/checkbox tanpa perubahan data tidak re-serialize
+csv = export_csv(df_export)
+json_text = export_json(df_export, lokasi)
 c1, c2 = st.columns(2)
 with c1:
     st.download_button("⬇️ Download CSV", data=csv, file_name=f"{adm1}_{loc_choice}.csv", mime="text/csv")